@@ -1,7 +1,6 @@
+import numpy as np
 import pandas as pd
 
-df = pd.read_csv("mqsim_summary.csv")
-
 metrics = [
     "host_BW_MiB_per_s",
     "host_IOPS",
@@ -18,106 +17,82 @@ metrics = [
     "energy_Energy_per_IO_Index",
 ]
 
+COLUMNS_NEEDED = [
+    "category",
+    "cache_size",
+    "io_queue_depth",
+    "channels",
+    "chips_per_channel",
+    "access_pattern",
+    "block_size",
+    "tpcc_variant",
+    "tsu_User_Transactions_Dequeued",
+    *metrics,
+]
 
-def cache_str_to_mib(s: str) -> float:
-    if not isinstance(s, str):
-        return float("nan")
-    s = s.strip()
-    if s.endswith("MB"):
-        return float(s[:-2])
-    if s.endswith("GB"):
-        return float(s[:-2]) * 1024
-    return float("nan")
+# 필요한 컬럼만 읽고, 반복되는 문자열 컬럼은 category로 읽어서 메모리/필터/groupby 비용을 줄임
+df = pd.read_csv(
+    "mqsim_summary.csv",
+    usecols=COLUMNS_NEEDED,
+    dtype={
+        "category": "category",
+        "access_pattern": "category",
+        "block_size": "category",
+        "cache_size": "category",
+        "tpcc_variant": "category",
+    },
+)
 
 
-rows = []
+def cache_str_to_mib(sizes: pd.Series) -> pd.Series:
+    # "0MB", "128MB", "1GB" → MiB 숫자 (형식이 다르면 NaN)
+    m = sizes.str.extract(r"(\d+)(MB|GB)")
+    return m[0].astype(float) * np.where(m[1] == "GB", 1024.0, 1.0)
 
-# ---------- synthetic: cache 축 (DRAM buffer size) ----------
-syn_cache = df[df["category"] == "cache"].copy()
-syn_cache["axis"] = "DRAM_Cache"
-syn_cache["axis_param"] = "cache_size"
-syn_cache["axis_value"] = syn_cache["cache_size"]
-syn_cache["axis_value_sort"] = syn_cache["cache_size"].map(cache_str_to_mib)
-syn_cache["workload"] = syn_cache.apply(
-    lambda r: f"{r['access_pattern']}_{r['block_size']}", axis=1
-)
-rows.append(syn_cache)
-
-# ---------- synthetic: NVMe queueing (IOQD) ----------
-syn_ioqd = df[df["category"] == "ioqd"].copy()
-syn_ioqd["axis"] = "NVMe_Queueing"
-syn_ioqd["axis_param"] = "io_queue_depth"
-syn_ioqd["axis_value"] = syn_ioqd["io_queue_depth"]
-syn_ioqd["axis_value_sort"] = syn_ioqd["io_queue_depth"]
-syn_ioqd["workload"] = syn_ioqd.apply(
-    lambda r: f"{r['access_pattern']}_{r['block_size']}", axis=1
-)
-rows.append(syn_ioqd)
-
-# ---------- synthetic: Flash parallelism (channels / ways 분리) ----------
-syn_ch = df[df["category"] == "ch_chip"].copy()
-
-# 채널 축: chips_per_channel == 4인 것만
-syn_ch_channels = syn_ch[syn_ch["chips_per_channel"] == 4].copy()
-syn_ch_channels["axis"] = "Flash_Channels"
-syn_ch_channels["axis_param"] = "channels"
-syn_ch_channels["axis_value"] = syn_ch_channels["channels"]
-syn_ch_channels["axis_value_sort"] = syn_ch_channels["channels"]
-syn_ch_channels["workload"] = syn_ch_channels.apply(
-    lambda r: f"{r['access_pattern']}_{r['block_size']}", axis=1
-)
-rows.append(syn_ch_channels)
-
-# ways 축: channels == 8인 것만
-syn_ch_ways = syn_ch[syn_ch["channels"] == 8].copy()
-syn_ch_ways["axis"] = "Flash_Ways"
-syn_ch_ways["axis_param"] = "chips_per_channel"
-syn_ch_ways["axis_value"] = syn_ch_ways["chips_per_channel"]
-syn_ch_ways["axis_value_sort"] = syn_ch_ways["chips_per_channel"]
-syn_ch_ways["workload"] = syn_ch_ways.apply(
-    lambda r: f"{r['access_pattern']}_{r['block_size']}", axis=1
+
+def workload_label(d: pd.DataFrame) -> pd.Series:
+    return d["access_pattern"].astype(str).str.cat(d["block_size"].astype(str), sep="_")
+
+
+# 축 정의: (category, tpcc_variant, (추가 필터 컬럼, 값), axis, axis_param)
+# - synthetic / TPCC 모두 같은 축으로 매핑
+# - Flash parallelism은 channels 축(chips_per_channel == 4)과 ways 축(channels == 8)으로 분리
+AXIS_SPECS = [
+    ("cache",   None,      None,                     "DRAM_Cache",     "cache_size"),
+    ("ioqd",    None,      None,                     "NVMe_Queueing",  "io_queue_depth"),
+    ("ch_chip", None,      ("chips_per_channel", 4), "Flash_Channels", "channels"),
+    ("ch_chip", None,      ("channels", 8),          "Flash_Ways",     "chips_per_channel"),
+    ("tpcc",    "cache",   None,                     "DRAM_Cache",     "cache_size"),
+    ("tpcc",    "ioqd",    None,                     "NVMe_Queueing",  "io_queue_depth"),
+    ("tpcc",    "ch_chip", ("chips_per_channel", 4), "Flash_Channels", "channels"),
+    ("tpcc",    "ch_chip", ("channels", 8),          "Flash_Ways",     "chips_per_channel"),
+]
+
+# 축마다 다시 계산하지 않도록 workload 이름과 cache 정렬값은 한 번만 만든다
+workload = pd.Series(
+    np.where(df["category"] == "tpcc", "tpcc", workload_label(df)), index=df.index
 )
-rows.append(syn_ch_ways)
-
-# ---------- TPCC: cache / ioqd / ch_chip 각각 동일 축으로 매핑 ----------
-tpcc = df[df["category"] == "tpcc"].copy()
-
-# TPCC - cache 축
-tpcc_cache = tpcc[tpcc["tpcc_variant"] == "cache"].copy()
-tpcc_cache["axis"] = "DRAM_Cache"
-tpcc_cache["axis_param"] = "cache_size"
-tpcc_cache["axis_value"] = tpcc_cache["cache_size"]
-tpcc_cache["axis_value_sort"] = tpcc_cache["cache_size"].map(cache_str_to_mib)
-tpcc_cache["workload"] = "tpcc"
-rows.append(tpcc_cache)
-
-# TPCC - IOQD 축
-tpcc_ioqd = tpcc[tpcc["tpcc_variant"] == "ioqd"].copy()
-tpcc_ioqd["axis"] = "NVMe_Queueing"
-tpcc_ioqd["axis_param"] = "io_queue_depth"
-tpcc_ioqd["axis_value"] = tpcc_ioqd["io_queue_depth"]
-tpcc_ioqd["axis_value_sort"] = tpcc_ioqd["io_queue_depth"]
-tpcc_ioqd["workload"] = "tpcc"
-rows.append(tpcc_ioqd)
-
-# TPCC - ch_chip → channels / ways로 분할
-tpcc_ch = tpcc[tpcc["tpcc_variant"] == "ch_chip"].copy()
-
-tpcc_ch_channels = tpcc_ch[tpcc_ch["chips_per_channel"] == 4].copy()
-tpcc_ch_channels["axis"] = "Flash_Channels"
-tpcc_ch_channels["axis_param"] = "channels"
-tpcc_ch_channels["axis_value"] = tpcc_ch_channels["channels"]
-tpcc_ch_channels["axis_value_sort"] = tpcc_ch_channels["channels"]
-tpcc_ch_channels["workload"] = "tpcc"
-rows.append(tpcc_ch_channels)
-
-tpcc_ch_ways = tpcc_ch[tpcc_ch["channels"] == 8].copy()
-tpcc_ch_ways["axis"] = "Flash_Ways"
-tpcc_ch_ways["axis_param"] = "chips_per_channel"
-tpcc_ch_ways["axis_value"] = tpcc_ch_ways["chips_per_channel"]
-tpcc_ch_ways["axis_value_sort"] = tpcc_ch_ways["chips_per_channel"]
-tpcc_ch_ways["workload"] = "tpcc"
-rows.append(tpcc_ch_ways)
+cache_mib = cache_str_to_mib(df["cache_size"])
+value_cols = ["tsu_User_Transactions_Dequeued", *metrics]
+
+rows = []
+for category, variant, extra, axis, axis_param in AXIS_SPECS:
+    mask = df["category"] == category
+    if variant is not None:
+        mask &= df["tpcc_variant"] == variant
+    if extra is not None:
+        col, val = extra
+        mask &= df[col] == val
+
+    rows.append(
+        df.loc[mask, value_cols].assign(
+            axis=axis,
+            axis_param=axis_param,
+            axis_value=df[axis_param],
+            axis_value_sort=cache_mib if axis_param == "cache_size" else df[axis_param],
+            workload=workload,
+        )
+    )
 
 axis_df = pd.concat(rows, ignore_index=True)
 
@@ -128,11 +103,17 @@ axis_df["tsu_diff_enq_deq"] = (
 )
 
 # 축/값/워크로드별 평균 metric 테이블
+axis_df["workload"] = axis_df["workload"].astype("category")
+# sort=False: 전역 정렬 생략 (행 순서는 축 정의/파일 순서를 따름)
 agg = (
     axis_df
-    .groupby(["axis", "axis_value", "axis_value_sort", "workload"])[metrics]
+    .groupby(
+        ["axis", "axis_value", "axis_value_sort", "workload"],
+        sort=False,
+        observed=True,
+        as_index=False,
+    )[metrics]
     .mean()
-    .reset_index()
 )
 
 agg.to_csv("mqsim_axis_metrics.csv", index=False)
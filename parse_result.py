@@ -33,9 +33,10 @@ crashing.
 import argparse
 import csv
 import os
-import re
-import xml.etree.ElementTree as ET
-from typing import Dict, Any, Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional
+
+import lxml.etree as ET
 
 # ----------------------------------------------------------------------
 # Simple per-state power model (arbitrary units, only for relative comparison)
@@ -47,6 +48,22 @@ POWER_MODEL = {
     "idle": 0.3,       # idle / background power
 }
 
+# Only these sections of a result file are summarized; everything else is
+# discarded while streaming.
+SECTION_TAGS = (
+    "Host.IO_Flow",
+    "SSDDevice.FTL",
+    "SSDDevice.TSU",
+    "SSDDevice.FlashChips",
+)
+
+# FlashChips attribute names
+_F_EXEC = "Fraction_of_Time_in_Execution"
+_F_DATA = "Fraction_of_Time_in_DataXfer"
+_F_OVER = "Fraction_of_Time_in_DataXfer_and_Execution"
+_F_IDLE = "Fraction_of_Time_Idle"
+_CHIP_FRACTIONS = (_F_EXEC, _F_DATA, _F_OVER, _F_IDLE)
+
 
 def parse_args():
     p = argparse.ArgumentParser(
@@ -68,41 +85,38 @@ def parse_args():
 # ----------------------------------------------------------------------
 # Helpers
 # ----------------------------------------------------------------------
+# int()/float() already ignore surrounding whitespace and reject "", so no
+# separate strip/empty checks are needed.
 def safe_int(text: Optional[str]) -> Optional[int]:
     if text is None:
         return None
-    text = text.strip()
-    if not text:
-        return None
     try:
         return int(text)
     except ValueError:
         try:
             return int(float(text))
-        except ValueError:
+        except (ValueError, OverflowError):
             return None
 
 
 def safe_float(text: Optional[str]) -> Optional[float]:
     if text is None:
         return None
-    text = text.strip()
-    if not text:
-        return None
     try:
         return float(text)
     except ValueError:
         return None
 
 
-def get_child_text(parent: ET.Element, tag: str) -> Optional[str]:
-    elem = parent.find(tag)
-    return elem.text if elem is not None else None
-
-
 # ----------------------------------------------------------------------
 # Experiment name parser (wl_cache…, wl_ch…, wl_ioqd…, wl_tpcc_…)
 # ----------------------------------------------------------------------
+def token_int(token: str, prefix: str) -> Optional[int]:
+    """Number after a fixed prefix, e.g. token_int("ioqd32", "ioqd") -> 32."""
+    digits = token[len(prefix):]
+    return safe_int(digits) if digits.isdigit() else None
+
+
 def parse_experiment_name(filename: str) -> Dict[str, Any]:
     """Parse MQSim result filename into structured fields.
 
@@ -148,13 +162,9 @@ def parse_experiment_name(filename: str) -> Dict[str, Any]:
     # Channel/chip scaling: wl_ch4_chip2_4kb_randread_scenario_1
     elif kind.startswith("ch"):
         info["category"] = "ch_chip"
-        m = re.match(r"ch(\d+)", kind)
-        if m:
-            info["channels"] = safe_int(m.group(1))
+        info["channels"] = token_int(kind, "ch")
         if len(parts) >= 3 and parts[2].startswith("chip"):
-            m2 = re.match(r"chip(\d+)", parts[2])
-            if m2:
-                info["chips_per_channel"] = safe_int(m2.group(1))
+            info["chips_per_channel"] = token_int(parts[2], "chip")
         if len(parts) >= 5:
             info["block_size"] = parts[3]
             info["access_pattern"] = parts[4]
@@ -162,9 +172,7 @@ def parse_experiment_name(filename: str) -> Dict[str, Any]:
     # IO queue depth scaling: wl_ioqd32_4kb_randwrite_scenario_1
     elif kind.startswith("ioqd"):
         info["category"] = "ioqd"
-        m = re.match(r"ioqd(\d+)", kind)
-        if m:
-            info["io_queue_depth"] = safe_int(m.group(1))
+        info["io_queue_depth"] = token_int(kind, "ioqd")
         if len(parts) >= 4:
             info["block_size"] = parts[2]
             info["access_pattern"] = parts[3]
@@ -180,44 +188,62 @@ def parse_experiment_name(filename: str) -> Dict[str, Any]:
                 info["cache_size"] = sub[len("cache") :]
             elif sub.startswith("ch"):
                 info["tpcc_variant"] = "ch_chip"
-                m = re.match(r"ch(\d+)", sub)
-                if m:
-                    info["channels"] = safe_int(m.group(1))
+                info["channels"] = token_int(sub, "ch")
                 if len(parts) >= 4 and parts[3].startswith("chip"):
-                    m2 = re.match(r"chip(\d+)", parts[3])
-                    if m2:
-                        info["chips_per_channel"] = safe_int(m2.group(1))
+                    info["chips_per_channel"] = token_int(parts[3], "chip")
             elif sub.startswith("ioqd"):
                 info["tpcc_variant"] = "ioqd"
-                m = re.match(r"ioqd(\d+)", sub)
-                if m:
-                    info["io_queue_depth"] = safe_int(m.group(1))
+                info["io_queue_depth"] = token_int(sub, "ioqd")
 
     return info
 
 
+# ----------------------------------------------------------------------
+# Streaming section loader
+# ----------------------------------------------------------------------
+def collect_sections(path: str) -> Dict[str, Any]:
+    """Stream a result file and return the elements named in SECTION_TAGS.
+
+    FlashChips appears once per chip and is collected into a list; the
+    other sections keep their first occurrence. Siblings preceding each
+    matched section are dropped from the tree as parsing goes, so only
+    the collected sections stay in memory.
+    """
+    sections: Dict[str, Any] = {"SSDDevice.FlashChips": []}
+    for _, elem in ET.iterparse(path, events=("end",), tag=SECTION_TAGS):
+        if elem.tag == "SSDDevice.FlashChips":
+            sections[elem.tag].append(elem)
+        else:
+            sections.setdefault(elem.tag, elem)
+        # Detached sections stay alive through the references held above.
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+    return sections
+
+
 # ----------------------------------------------------------------------
 # Parsers for each section of the XML
 # ----------------------------------------------------------------------
-def parse_host_metrics(root: ET.Element) -> Dict[str, Any]:
+def parse_host_metrics(host: Optional[ET._Element]) -> Dict[str, Any]:
     out: Dict[str, Any] = {}
-    host = root.find("Host/Host.IO_Flow")
     if host is None:
         return out
 
+    _f = host.findtext
+
     # Basic counts and IOPS
-    out["host_Request_Count"]        = safe_int(get_child_text(host, "Request_Count"))
-    out["host_Read_Request_Count"]   = safe_int(get_child_text(host, "Read_Request_Count"))
-    out["host_Write_Request_Count"]  = safe_int(get_child_text(host, "Write_Request_Count"))
+    out["host_Request_Count"]        = safe_int(_f("Request_Count"))
+    out["host_Read_Request_Count"]   = safe_int(_f("Read_Request_Count"))
+    out["host_Write_Request_Count"]  = safe_int(_f("Write_Request_Count"))
 
-    out["host_IOPS"]                 = safe_float(get_child_text(host, "IOPS"))
-    out["host_Read_IOPS"]            = safe_float(get_child_text(host, "Read_IOPS"))
-    out["host_Write_IOPS"]           = safe_float(get_child_text(host, "Write_IOPS"))
+    out["host_IOPS"]                 = safe_float(_f("IOPS"))
+    out["host_Read_IOPS"]            = safe_float(_f("Read_IOPS"))
+    out["host_Write_IOPS"]           = safe_float(_f("Write_IOPS"))
 
     # Bandwidth is reported by MQSim in bytes/second
-    bw_total = safe_float(get_child_text(host, "Bandwidth"))
-    bw_read  = safe_float(get_child_text(host, "Read_Bandwidth"))
-    bw_write = safe_float(get_child_text(host, "Write_Bandwidth"))
+    bw_total = safe_float(_f("Bandwidth"))
+    bw_read  = safe_float(_f("Read_Bandwidth"))
+    bw_write = safe_float(_f("Write_Bandwidth"))
 
     out["host_BW_Bytes_per_s"]       = bw_total
     out["host_Read_BW_Bytes_per_s"]  = bw_read
@@ -232,8 +258,8 @@ def parse_host_metrics(root: ET.Element) -> Dict[str, Any]:
         out["host_Write_BW_MiB_per_s"] = bw_write / mib
 
     # Latency (MQSim units; often nanoseconds or microseconds depending on build)
-    dev_resp = safe_float(get_child_text(host, "Device_Response_Time"))
-    e2e_delay = safe_float(get_child_text(host, "End_to_End_Request_Delay"))
+    dev_resp = safe_float(_f("Device_Response_Time"))
+    e2e_delay = safe_float(_f("End_to_End_Request_Delay"))
 
     out["host_Device_Response_Time"] = dev_resp
     out["host_End_to_End_Request_Delay"] = e2e_delay
@@ -246,12 +272,13 @@ def parse_host_metrics(root: ET.Element) -> Dict[str, Any]:
     return out
 
 
-def parse_ftl_metrics(root: ET.Element) -> Dict[str, Any]:
+def parse_ftl_metrics(ftl: Optional[ET._Element]) -> Dict[str, Any]:
     out: Dict[str, Any] = {}
-    ftl = root.find("SSDDevice/SSDDevice.FTL")
     if ftl is None:
         return out
 
+    a = ftl.attrib
+
     # --- Flash command counts -------------------------------------------------
     total_read = 0
     total_prog = 0
@@ -260,24 +287,34 @@ def parse_ftl_metrics(root: ET.Element) -> Dict[str, Any]:
     mapping_prog = 0
     mapping_erase = 0
 
-    for name, val in ftl.attrib.items():
+    for name, val in a.items():
+        # "Issued_Flash_Read_CMD", "Issued_Flash_Program_CMD", "Issued_Flash_Erase_CMD", etc.
+        # and their "..._CMD_For_Mapping" counterparts; skip everything else early.
+        if name.endswith("_CMD"):
+            is_map = False
+        elif name.endswith("_CMD_For_Mapping"):
+            is_map = True
+        else:
+            continue
         cnt = safe_int(val)
         if cnt is None:
             continue
-        # "Issued_Flash_Read_CMD", "Issued_Flash_Program_CMD", "Issued_Flash_Erase_CMD", etc.
-        if "Read_CMD" in name and "For_Mapping" not in name:
-            total_read += cnt
-        if "Program_CMD" in name and "For_Mapping" not in name:
-            total_prog += cnt
-        if "Erase_CMD" in name and "For_Mapping" not in name:
-            total_erase += cnt
-
-        if "Read_CMD_For_Mapping" in name:
-            mapping_read += cnt
-        if "Program_CMD_For_Mapping" in name:
-            mapping_prog += cnt
-        if "Erase_CMD_For_Mapping" in name:
-            mapping_erase += cnt
+
+        if "_Read_CMD" in name:
+            if is_map:
+                mapping_read += cnt
+            else:
+                total_read += cnt
+        elif "_Program_CMD" in name:
+            if is_map:
+                mapping_prog += cnt
+            else:
+                total_prog += cnt
+        elif "_Erase_CMD" in name:
+            if is_map:
+                mapping_erase += cnt
+            else:
+                total_erase += cnt
 
     out["ftl_Total_Flash_Read_CMD"] = total_read
     out["ftl_Total_Flash_Program_CMD"] = total_prog
@@ -288,12 +325,12 @@ def parse_ftl_metrics(root: ET.Element) -> Dict[str, Any]:
     out["ftl_Mapping_Erase_CMD"] = mapping_erase
 
     # --- CMT / address mapping stats -----------------------------------------
-    total_queries = safe_int(ftl.attrib.get("Total_CMT_Queries", None))
-    hits = safe_int(ftl.attrib.get("CMT_Hits", None))
-    total_read_queries = safe_int(ftl.attrib.get("Total_CMT_Read_Queries", None))
-    read_hits = safe_int(ftl.attrib.get("CMT_Read_Hits", None))
-    total_write_queries = safe_int(ftl.attrib.get("Total_CMT_Write_Queries", None))
-    write_hits = safe_int(ftl.attrib.get("CMT_Write_Hits", None))
+    total_queries = safe_int(a.get("Total_CMT_Queries", None))
+    hits = safe_int(a.get("CMT_Hits", None))
+    total_read_queries = safe_int(a.get("Total_CMT_Read_Queries", None))
+    read_hits = safe_int(a.get("CMT_Read_Hits", None))
+    total_write_queries = safe_int(a.get("Total_CMT_Write_Queries", None))
+    write_hits = safe_int(a.get("CMT_Write_Hits", None))
 
     out["ftl_Total_CMT_Queries"] = total_queries
     out["ftl_CMT_Hits"] = hits
@@ -312,17 +349,16 @@ def parse_ftl_metrics(root: ET.Element) -> Dict[str, Any]:
     out["ftl_CMT_Write_Hit_Rate"] = ratio(write_hits, total_write_queries)
 
     # --- GC stats -------------------------------------------------------------
-    out["ftl_Total_GC_Executions"] = safe_int(ftl.attrib.get("Total_GC_Executions", None))
+    out["ftl_Total_GC_Executions"] = safe_int(a.get("Total_GC_Executions", None))
     out["ftl_Average_Page_Movement_For_GC"] = safe_float(
-        ftl.attrib.get("Average_Page_Movement_For_GC", None)
+        a.get("Average_Page_Movement_For_GC", None)
     )
 
     return out
 
 
-def parse_tsu_metrics(root: ET.Element) -> Dict[str, Any]:
+def parse_tsu_metrics(tsu: Optional[ET._Element]) -> Dict[str, Any]:
     out: Dict[str, Any] = {}
-    tsu = root.find("SSDDevice/SSDDevice.TSU")
     if tsu is None:
         return out
 
@@ -339,21 +375,28 @@ def parse_tsu_metrics(root: ET.Element) -> Dict[str, Any]:
             "queue_entries": 0.0,
         }
 
+    user_stats = stats["User"]
+    gc_stats = stats["GC"]
+    mapping_stats = stats["Mapping"]
+
     for q in tsu:
-        name = q.attrib.get("Name", "")
-        if "_" in name:
-            prefix = name.split("_", 1)[0]
+        a = q.attrib
+        # Queue names look like "User_Read_TR_Queue@0@0@HIGH"
+        name = a.get("Name", "")
+        if name.startswith("User_") or name == "User":
+            s = user_stats
+        elif name.startswith("GC_") or name == "GC":
+            s = gc_stats
+        elif name.startswith("Mapping_") or name == "Mapping":
+            s = mapping_stats
         else:
-            prefix = name
-        if prefix not in prefixes:
             continue
 
-        enq = safe_int(q.attrib.get("No_Of_Transactions_Enqueued", None)) or 0
-        deq = safe_int(q.attrib.get("No_Of_Transactions_Dequeued", None)) or 0
-        avg_wait = safe_float(q.attrib.get("Avg_Transaction_Waiting_Time", None)) or 0.0
-        avg_q_len = safe_float(q.attrib.get("Avg_Queue_Length", None)) or 0.0
+        enq = safe_int(a.get("No_Of_Transactions_Enqueued", None)) or 0
+        deq = safe_int(a.get("No_Of_Transactions_Dequeued", None)) or 0
+        avg_wait = safe_float(a.get("Avg_Transaction_Waiting_Time", None)) or 0.0
+        avg_q_len = safe_float(a.get("Avg_Queue_Length", None)) or 0.0
 
-        s = stats[prefix]
         s["enq"] += enq
         s["deq"] += deq
         s["wait_time_sum"] += avg_wait * enq
@@ -382,56 +425,54 @@ def parse_tsu_metrics(root: ET.Element) -> Dict[str, Any]:
     return out
 
 
-def parse_chip_metrics_and_energy(root: ET.Element, host_reqs: Optional[int]) -> Dict[str, Any]:
+def parse_chip_metrics_and_energy(chips: List[ET._Element], host_reqs: Optional[int]) -> Dict[str, Any]:
     out: Dict[str, Any] = {}
-    chips = root.findall("SSDDevice/SSDDevice.FlashChips")
     if not chips:
         return out
 
     n = float(len(chips))
 
-    # Simple averages across all chips
-    sum_exec = sum(
-        safe_float(ch.attrib.get("Fraction_of_Time_in_Execution", "0")) or 0.0
-        for ch in chips
-    )
-    sum_data = sum(
-        safe_float(ch.attrib.get("Fraction_of_Time_in_DataXfer", "0")) or 0.0
-        for ch in chips
-    )
-    sum_overlap = sum(
-        safe_float(ch.attrib.get("Fraction_of_Time_in_DataXfer_and_Execution", "0")) or 0.0
-        for ch in chips
-    )
-    sum_idle = sum(
-        safe_float(ch.attrib.get("Fraction_of_Time_Idle", "0")) or 0.0
-        for ch in chips
-    )
-
-    out["chip_Avg_Fraction_Exec"] = sum_exec / n
-    out["chip_Avg_Fraction_DataXfer"] = sum_data / n
-    out["chip_Avg_Fraction_Overlap"] = sum_overlap / n
-    out["chip_Avg_Fraction_Idle"] = sum_idle / n
+    pw_exec = POWER_MODEL["exec"]
+    pw_data = POWER_MODEL["dataxfer"]
+    pw_overlap = POWER_MODEL["overlap"]
+    pw_idle = POWER_MODEL["idle"]
 
-    # Energy index: very simple model based on the above fractions
+    # Simple averages across all chips, plus the energy index, in one pass.
     # NOTE: These fractions in MQSim are not strictly exclusive,
-    # so this is only a *relative* heuristic, not an exact energy model.
+    # so the energy index is only a *relative* heuristic, not an exact energy model.
+    sum_exec = 0.0
+    sum_data = 0.0
+    sum_overlap = 0.0
+    sum_idle = 0.0
     total_power_index = 0.0
     for ch in chips:
-        f_exec = safe_float(ch.attrib.get("Fraction_of_Time_in_Execution", "0")) or 0.0
-        f_data = safe_float(ch.attrib.get("Fraction_of_Time_in_DataXfer", "0")) or 0.0
-        f_overlap = safe_float(
-            ch.attrib.get("Fraction_of_Time_in_DataXfer_and_Execution", "0")
-        ) or 0.0
-        f_idle = safe_float(ch.attrib.get("Fraction_of_Time_Idle", "0")) or 0.0
-
-        power_index = (
-            f_exec * POWER_MODEL["exec"]
-            + f_data * POWER_MODEL["dataxfer"]
-            + f_overlap * POWER_MODEL["overlap"]
-            + f_idle * POWER_MODEL["idle"]
+        a = ch.attrib
+        # MQSim writes plain numbers; only fall back to safe_float on odd values
+        try:
+            f_exec = float(a.get(_F_EXEC) or 0.0)
+            f_data = float(a.get(_F_DATA) or 0.0)
+            f_overlap = float(a.get(_F_OVER) or 0.0)
+            f_idle = float(a.get(_F_IDLE) or 0.0)
+        except ValueError:
+            f_exec, f_data, f_overlap, f_idle = (
+                safe_float(a.get(k)) or 0.0 for k in _CHIP_FRACTIONS
+            )
+
+        sum_exec += f_exec
+        sum_data += f_data
+        sum_overlap += f_overlap
+        sum_idle += f_idle
+        total_power_index += (
+            f_exec * pw_exec
+            + f_data * pw_data
+            + f_overlap * pw_overlap
+            + f_idle * pw_idle
         )
-        total_power_index += power_index
+
+    out["chip_Avg_Fraction_Exec"] = sum_exec / n
+    out["chip_Avg_Fraction_DataXfer"] = sum_data / n
+    out["chip_Avg_Fraction_Overlap"] = sum_overlap / n
+    out["chip_Avg_Fraction_Idle"] = sum_idle / n
 
     out["energy_Total_Chip_Power_Index"] = total_power_index
 
@@ -446,6 +487,71 @@ def parse_chip_metrics_and_energy(root: ET.Element, host_reqs: Optional[int]) ->
 # ----------------------------------------------------------------------
 # Main aggregation
 # ----------------------------------------------------------------------
+# Every column summarize_file() can emit, sorted for a stable CSV layout.
+HEADER = [
+    "access_pattern",
+    "block_size",
+    "cache_size",
+    "category",
+    "channels",
+    "chip_Avg_Fraction_DataXfer",
+    "chip_Avg_Fraction_Exec",
+    "chip_Avg_Fraction_Idle",
+    "chip_Avg_Fraction_Overlap",
+    "chips_per_channel",
+    "energy_Energy_per_IO_Index",
+    "energy_Total_Chip_Power_Index",
+    "exp_name",
+    "ftl_Average_Page_Movement_For_GC",
+    "ftl_CMT_Hit_Rate",
+    "ftl_CMT_Hits",
+    "ftl_CMT_Read_Hit_Rate",
+    "ftl_CMT_Read_Hits",
+    "ftl_CMT_Write_Hit_Rate",
+    "ftl_CMT_Write_Hits",
+    "ftl_Mapping_Erase_CMD",
+    "ftl_Mapping_Program_CMD",
+    "ftl_Mapping_Read_CMD",
+    "ftl_Total_CMT_Queries",
+    "ftl_Total_CMT_Read_Queries",
+    "ftl_Total_CMT_Write_Queries",
+    "ftl_Total_Flash_Erase_CMD",
+    "ftl_Total_Flash_Program_CMD",
+    "ftl_Total_Flash_Read_CMD",
+    "ftl_Total_GC_Executions",
+    "host_BW_Bytes_per_s",
+    "host_BW_MiB_per_s",
+    "host_Device_Response_Time",
+    "host_E2E_Latency_ms_assuming_us",
+    "host_End_to_End_Request_Delay",
+    "host_IOPS",
+    "host_Read_BW_Bytes_per_s",
+    "host_Read_BW_MiB_per_s",
+    "host_Read_IOPS",
+    "host_Read_Request_Count",
+    "host_Request_Count",
+    "host_Write_BW_Bytes_per_s",
+    "host_Write_BW_MiB_per_s",
+    "host_Write_IOPS",
+    "host_Write_Request_Count",
+    "io_queue_depth",
+    "parse_error",
+    "tpcc_variant",
+    "tsu_GC_Avg_Queue_Length",
+    "tsu_GC_Avg_Waiting_Time",
+    "tsu_GC_Transactions_Dequeued",
+    "tsu_GC_Transactions_Enqueued",
+    "tsu_Mapping_Avg_Queue_Length",
+    "tsu_Mapping_Avg_Waiting_Time",
+    "tsu_Mapping_Transactions_Dequeued",
+    "tsu_Mapping_Transactions_Enqueued",
+    "tsu_User_Avg_Queue_Length",
+    "tsu_User_Avg_Waiting_Time",
+    "tsu_User_Transactions_Dequeued",
+    "tsu_User_Transactions_Enqueued",
+]
+
+
 def summarize_file(path: str) -> Dict[str, Any]:
     row: Dict[str, Any] = {}
 
@@ -453,27 +559,26 @@ def summarize_file(path: str) -> Dict[str, Any]:
     row.update(parse_experiment_name(path))
 
     try:
-        tree = ET.parse(path)
-        root = tree.getroot()
+        sections = collect_sections(path)
     except Exception as e:
         # Record the error but keep going
         row["parse_error"] = str(e)
         return row
 
     # Host metrics
-    host = parse_host_metrics(root)
+    host = parse_host_metrics(sections.get("Host.IO_Flow"))
     row.update(host)
 
     host_req_cnt = host.get("host_Request_Count", None)
 
     # FTL metrics
-    row.update(parse_ftl_metrics(root))
+    row.update(parse_ftl_metrics(sections.get("SSDDevice.FTL")))
 
     # TSU (user / mapping / GC transaction stats)
-    row.update(parse_tsu_metrics(root))
+    row.update(parse_tsu_metrics(sections.get("SSDDevice.TSU")))
 
     # Chip-level activity and simple energy index
-    row.update(parse_chip_metrics_and_energy(root, host_req_cnt))
+    row.update(parse_chip_metrics_and_energy(sections["SSDDevice.FlashChips"], host_req_cnt))
 
     return row
 
@@ -484,31 +589,28 @@ def main():
     output_csv = args.output_csv
 
     # Collect all XML files in the directory
-    xml_files = [
-        os.path.join(input_dir, f)
-        for f in os.listdir(input_dir)
-        if f.lower().endswith(".xml") and f.startswith("wl_")
-    ]
-    xml_files.sort()
+    with os.scandir(input_dir) as it:
+        xml_files = sorted(
+            e.path
+            for e in it
+            if e.name.startswith("wl_") and e.name.lower().endswith(".xml") and e.is_file()
+        )
 
     if not xml_files:
         raise SystemExit(f"No wl_*.xml files found in {input_dir!r}")
 
-    rows = [summarize_file(p) for p in xml_files]
-
-    # Determine CSV header as the union of all keys (sorted for stability)
-    all_keys = set()
-    for r in rows:
-        all_keys.update(r.keys())
-    header = sorted(all_keys)
-
-    with open(output_csv, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=header)
+    # Files are independent, so summarize them across all cores. Each task
+    # is short, so batch several per IPC round trip. Rows are written as
+    # they come back instead of being collected first.
+    n_rows = 0
+    with open(output_csv, "w", newline="") as f, ProcessPoolExecutor() as ex:
+        writer = csv.DictWriter(f, fieldnames=HEADER, extrasaction="ignore")
         writer.writeheader()
-        for r in rows:
+        for r in ex.map(summarize_file, xml_files, chunksize=8):
             writer.writerow(r)
+            n_rows += 1
 
-    print(f"Wrote summary for {len(rows)} MQSim result files to {output_csv}")
+    print(f"Wrote summary for {n_rows} MQSim result files to {output_csv}")
 
 
 if __name__ == "__main__":
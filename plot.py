@@ -2,7 +2,8 @@
 import os
 import re
 import math
-from typing import Optional
+from typing import List, Optional, Tuple
+import numpy as np
 import pandas as pd
 import matplotlib
 matplotlib.use("Agg")
@@ -12,115 +13,154 @@ import matplotlib.pyplot as plt
 SUMMARY_CSV = "mqsim_summary.csv"
 OUTPUT_ROOT = "plots"  # 이 아래에 cache/ioqd/channels/ways 폴더 생김
 
+_RE_CACHE_SIZE = re.compile(r"(\d+)(MB|GB)")
+
+METRICS = [
+    "host_BW_MiB_per_s",
+    "host_IOPS",
+    "host_E2E_Latency_ms_assuming_us",
+    "tsu_User_Transactions_Enqueued",
+    "ftl_Total_Flash_Read_CMD",
+    "ftl_Total_Flash_Program_CMD",
+    "ftl_Total_Flash_Erase_CMD",
+    "ftl_CMT_Hit_Rate",
+    "ftl_Total_GC_Executions",
+    "chip_Avg_Fraction_Idle",
+    "chip_Avg_Fraction_DataXfer",
+    "chip_Avg_Fraction_Exec",
+    "energy_Energy_per_IO_Index",
+]
+
+# build_dataframe()/main()에서 쓰는 컬럼만 읽음
+# (CSV에 없는 컬럼은 건너뜀: cache_size, tsu_User_Transactions_Dequeued 등은 선택 사항)
+COLUMNS_NEEDED = {
+    "access_pattern",
+    "block_size",
+    "cache_size",
+    "io_queue_depth",
+    "channels",
+    "chips_per_channel",
+    "tsu_User_Transactions_Dequeued",
+    *METRICS,
+}
+
+# x축 이름
+X_LABELS = {
+    "cache_size_MiB": "DRAM cache size (MiB)",
+    "io_queue_depth": "I/O queue depth",
+    "channels": "Number of channels",
+    "chips_per_channel": "Chips per channel (ways)",
+}
+
+# title에 쓸 이름
+Y_LABELS = {
+    "host_BW_MiB_per_s" : "Host Bandwidth (MiB/s)",
+    "host_IOPS" : "Host IOPS",
+    "host_E2E_Latency_ms_assuming_us" : "Host E2E Latency (ms)",
+    "tsu_User_Transactions_Enqueued" : "TSU User Transactions Enqueued",
+    "ftl_Total_Flash_Read_CMD" : "FTL Total Flash Read CMD",
+    "ftl_Total_Flash_Program_CMD" : "FTL Total Flash Program CMD",
+    "ftl_Total_Flash_Erase_CMD" : "FTL Total Flash Erase CMD",
+    "ftl_CMT_Hit_Rate" : "FTL CMT Hit Rate",
+    "ftl_Total_GC_Executions" : "FTL Total GC Executions",
+    "chip_Avg_Fraction_Idle" : "Chip Avg Fraction Idle",
+    "chip_Avg_Fraction_DataXfer" : "Chip Avg Fraction DataXfer",
+    "chip_Avg_Fraction_Exec" : "Chip Avg Fraction Exec",
+    "energy_Energy_per_IO_Index" : "Power(Energy/IO)",
+}
+
+SUBPLOT_DEFAULTS = {
+    k: matplotlib.rcParams[f"figure.subplot.{k}"]
+    for k in ("left", "right", "bottom", "top", "wspace", "hspace")
+}
+
 
 def build_dataframe(path: str) -> pd.DataFrame:
-    df = pd.read_csv(path)
+    df = pd.read_csv(
+        path,
+        usecols=lambda c: c in COLUMNS_NEEDED,
+        dtype={
+            "access_pattern": "category",
+            "block_size": "category",
+            "cache_size": "category",
+        },
+    )
 
     # synthetic + tpcc 통합 workload 이름
-    def workload_label(row):
-        if row["access_pattern"] == "tpcc":
-            return "tpcc"
-        else:
-            return f"{row['access_pattern']}_{row['block_size']}"
-
-    df["workload"] = df.apply(workload_label, axis=1)
+    ap = df["access_pattern"]
+    bs = df["block_size"].astype(str)
+    df["workload"] = np.where(ap.eq("tpcc"), "tpcc", ap.astype(str) + "_" + bs)
 
     # "0MB", "128MB", "256MB", "1GB" → MiB 숫자
-    def parse_cache_size(s):
-        if pd.isna(s):
-            return math.nan
-        m = re.match(r"(\d+)(MB|GB)", str(s))
-        if not m:
-            return math.nan
-        v = int(m.group(1))
-        u = m.group(2)
-        if u == "MB":
-            return float(v)
-        elif u == "GB":
-            return float(v * 1024)
-        return math.nan
-
     if "cache_size" in df.columns:
-        df["cache_size_MiB"] = df["cache_size"].apply(parse_cache_size)
+        m = df["cache_size"].astype(str).str.extract(_RE_CACHE_SIZE)
+        df["cache_size_MiB"] = m[0].astype(float) * m[1].map({"MB": 1.0, "GB": 1024.0})
     else:
         df["cache_size_MiB"] = math.nan
 
     return df
 
 
-def plot_metric_vs_param(df: pd.DataFrame,
+def group_by_workload(df: pd.DataFrame, param_col: str) -> List[Tuple[str, pd.DataFrame]]:
+    """
+    param_col/workload가 비어있지 않은 row를 (workload, x) 순으로 정렬해서
+    workload별로 나눔. 같은 param_col의 모든 metric plot에서 재사용.
+    """
+    base = df.dropna(subset=[param_col, "workload"])
+    # 정렬을 위해 float로 변환
+    base = base.assign(x=base[param_col].astype(float)).sort_values(["workload", "x"])
+    return list(base.groupby("workload", sort=False))
+
+
+def plot_metric_vs_param(ax: plt.Axes,
+                         grouped: List[Tuple[str, pd.DataFrame]],
                          param_col: str,
                          metric_col: str,
                          outdir: str,
                          title_prefix: Optional[str] = None) -> None:
     """
+    ax: main()에서 한 번 만든 Axes (매 plot마다 지우고 다시 그림)
+    grouped: group_by_workload(df, param_col) 결과
     param_col: 'cache_size_MiB' / 'io_queue_depth' / 'channels' / 'chips_per_channel'
     metric_col: 위에서 지정한 metric 이름들
     """
 
-    # 필요한 컬럼+workload가 비어있지 않은 row만 사용
-    use = df.dropna(subset=[param_col, metric_col, "workload"]).copy()
-    if use.empty:
+    # metric 값이 비어있지 않은 row만 사용
+    series = []
+    for workload, sub in grouped:
+        sub = sub[sub[metric_col].notna()]
+        if not sub.empty:
+            series.append((workload, sub))
+    if not series:
         print(f"[skip] {param_col}, {metric_col} 에 해당하는 데이터가 없음")
         return
 
-    # x축 이름
-    if param_col == "cache_size_MiB":
-        x_label = "DRAM cache size (MiB)"
-    elif param_col == "io_queue_depth":
-        x_label = "I/O queue depth"
-    elif param_col == "channels":
-        x_label = "Number of channels"
-    elif param_col == "chips_per_channel":
-        x_label = "Chips per channel (ways)"
-    else:
-        x_label = param_col
-
-    # title에 쓸 이름
-    labels = {
-       "host_BW_MiB_per_s" : "Host Bandwidth (MiB/s)",
-        "host_IOPS" : "Host IOPS",
-        "host_E2E_Latency_ms_assuming_us" : "Host E2E Latency (ms)",
-        "tsu_User_Transactions_Enqueued" : "TSU User Transactions Enqueued",
-        "ftl_Total_Flash_Read_CMD" : "FTL Total Flash Read CMD",
-        "ftl_Total_Flash_Program_CMD" : "FTL Total Flash Program CMD",
-        "ftl_Total_Flash_Erase_CMD" : "FTL Total Flash Erase CMD",
-        "ftl_CMT_Hit_Rate" : "FTL CMT Hit Rate",
-        "ftl_Total_GC_Executions" : "FTL Total GC Executions",
-        "chip_Avg_Fraction_Idle" : "Chip Avg Fraction Idle",
-        "chip_Avg_Fraction_DataXfer" : "Chip Avg Fraction DataXfer",
-        "chip_Avg_Fraction_Exec" : "Chip Avg Fraction Exec",
-        "energy_Energy_per_IO_Index" : "Power(Energy/IO)", 
-    }
-    y_label = labels[metric_col] if metric_col in labels else metric_col
-
-
-    # 정렬을 위해 float로 변환
-    use["x"] = use[param_col].astype(float)
-    use = use.sort_values(["workload", "x"])
+    x_label = X_LABELS.get(param_col, param_col)
+    y_label = Y_LABELS.get(metric_col, metric_col)
 
-    plt.figure()
-    for workload, sub in use.groupby("workload"):
-        sub = sub.sort_values("x")
-        plt.plot(sub["x"], sub[metric_col], marker="o", label=workload)
+    ax.cla()
+    for workload, sub in series:
+        ax.plot(sub["x"], sub[metric_col], marker="o", label=workload)
 
-    plt.xlabel(x_label)
-    plt.ylabel(y_label)
+    ax.set_xlabel(x_label)
+    ax.set_ylabel(y_label)
 
     label_prefix = title_prefix if title_prefix is not None else x_label
-    plt.title(f"{y_label} vs {label_prefix}")
+    ax.set_title(f"{y_label} vs {label_prefix}")
 
-    plt.legend()
-    plt.grid(True)
+    ax.legend()
+    ax.grid(True)
 
     os.makedirs(outdir, exist_ok=True)
     safe_metric = metric_col.replace("/", "_per_").replace(" ", "_")
     fname = f"{safe_metric}_vs_{param_col}.png"
 
-    plt.tight_layout()
+    fig = ax.figure
+    # 이전 plot의 tight_layout 여백이 남지 않도록 기본값으로 되돌린 뒤 다시 계산
+    fig.subplots_adjust(**SUBPLOT_DEFAULTS)
+    fig.tight_layout()
     out_path = os.path.join(outdir, fname)
-    plt.savefig(out_path)
-    plt.close()
+    fig.savefig(out_path)
 
     print(f"[saved] {out_path}")
 
@@ -134,65 +174,32 @@ def main():
         print("[info] tsu enq-deq diff summary:")
         print(diff.describe())
 
-    metrics = [
-        "host_BW_MiB_per_s",
-        "host_IOPS",
-        "host_E2E_Latency_ms_assuming_us",
-        "tsu_User_Transactions_Enqueued",
-        "ftl_Total_Flash_Read_CMD",
-        "ftl_Total_Flash_Program_CMD",
-        "ftl_Total_Flash_Erase_CMD",
-        "ftl_CMT_Hit_Rate",
-        "ftl_Total_GC_Executions",
-        "chip_Avg_Fraction_Idle",
-        "chip_Avg_Fraction_DataXfer",
-        "chip_Avg_Fraction_Exec",
-        "energy_Energy_per_IO_Index",
+    axes = [
+        # (param_col, 하위 폴더, title_prefix)
+        ("cache_size_MiB", "cache", "DRAM cache size"),                   # 1) DRAM cache axis
+        ("io_queue_depth", "io_queue_depth", "I/O queue depth"),          # 2) NVMe queue depth axis
+        ("channels", "channels", "Flash channels"),                       # 3) Flash parallelism – channels
+        ("chips_per_channel", "ways", "Flash ways (chips per channel)"),  # 4) Flash parallelism – ways
     ]
 
-    # 1) DRAM cache axis
-    cache_dir = os.path.join(OUTPUT_ROOT, "cache")
-    for metric in metrics:
-        plot_metric_vs_param(
-            df,
-            param_col="cache_size_MiB",
-            metric_col=metric,
-            outdir=cache_dir,
-            title_prefix="DRAM cache size",
-        )
-
-    # 2) NVMe queue depth axis
-    ioqd_dir = os.path.join(OUTPUT_ROOT, "io_queue_depth")
-    for metric in metrics:
-        plot_metric_vs_param(
-            df,
-            param_col="io_queue_depth",
-            metric_col=metric,
-            outdir=ioqd_dir,
-            title_prefix="I/O queue depth",
-        )
-
-    # 3) Flash parallelism – channels axis
-    ch_dir = os.path.join(OUTPUT_ROOT, "channels")
-    for metric in metrics:
-        plot_metric_vs_param(
-            df,
-            param_col="channels",
-            metric_col=metric,
-            outdir=ch_dir,
-            title_prefix="Flash channels",
-        )
-
-    # 4) Flash parallelism – ways (chips per channel) axis
-    ways_dir = os.path.join(OUTPUT_ROOT, "ways")
-    for metric in metrics:
-        plot_metric_vs_param(
-            df,
-            param_col="chips_per_channel",
-            metric_col=metric,
-            outdir=ways_dir,
-            title_prefix="Flash ways (chips per channel)",
-        )
+    # Figure 생성 비용을 줄이기 위해 모든 plot에서 같은 Figure/Axes 재사용
+    fig, ax = plt.subplots()
+
+    for param_col, subdir, title_prefix in axes:
+        # axis마다 한 번만 정렬/그룹핑하고 모든 metric에서 재사용
+        grouped = group_by_workload(df, param_col)
+        outdir = os.path.join(OUTPUT_ROOT, subdir)
+        for metric in METRICS:
+            plot_metric_vs_param(
+                ax,
+                grouped,
+                param_col=param_col,
+                metric_col=metric,
+                outdir=outdir,
+                title_prefix=title_prefix,
+            )
+
+    plt.close(fig)
 
 
 if __name__ == "__main__":
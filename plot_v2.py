@@ -1,9 +1,14 @@
 #!/usr/bin/env python3
 import os
 import re
+import hashlib
 import math
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional, Tuple
 
+import numpy as np
 import pandas as pd
+import pyarrow.csv as pa_csv
 import matplotlib
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt
@@ -11,167 +16,298 @@ import matplotlib.pyplot as plt
 SUMMARY_CSV = "mqsim_summary.csv"
 OUTPUT_ROOT = "plots_v2"
 
+METRICS = [
+    "host_BW_MiB_per_s",
+    "host_IOPS",
+    "host_E2E_Latency_ms_assuming_us",
+    "tsu_User_Transactions_Enqueued",
+    "ftl_Total_Flash_Read_CMD",
+    "ftl_Total_Flash_Program_CMD",
+    "ftl_Total_Flash_Erase_CMD",
+    "ftl_CMT_Hit_Rate",
+    "ftl_Total_GC_Executions",
+    "chip_Avg_Fraction_Idle",
+    "chip_Avg_Fraction_DataXfer",
+    "chip_Avg_Fraction_Exec",
+    "energy_Energy_per_IO_Index",
+]
+
+# plot y축/title에 쓸 이름
+_METRIC_LABELS = {
+    "host_BW_MiB_per_s" : "Host Bandwidth (MiB/s)",
+    "host_IOPS" : "Host IOPS",
+    "host_E2E_Latency_ms_assuming_us" : "Host E2E Latency (ms)",
+    "tsu_User_Transactions_Enqueued" : "TSU User Transactions Enqueued",
+    "ftl_Total_Flash_Read_CMD" : "FTL Total Flash Read CMD",
+    "ftl_Total_Flash_Program_CMD" : "FTL Total Flash Program CMD",
+    "ftl_Total_Flash_Erase_CMD" : "FTL Total Flash Erase CMD",
+    "ftl_CMT_Hit_Rate" : "FTL CMT Hit Rate",
+    "ftl_Total_GC_Executions" : "FTL Total GC Executions",
+    "chip_Avg_Fraction_Idle" : "Chip Avg Fraction Idle",
+    "chip_Avg_Fraction_DataXfer" : "Chip Avg Fraction DataXfer",
+    "chip_Avg_Fraction_Exec" : "Chip Avg Fraction Exec",
+    "energy_Energy_per_IO_Index" : "Power(Energy/IO)",
+}
+
+# build_dataframe()에서 읽을 컬럼 (나머지는 파싱하지 않음)
+NEEDED = ["access_pattern", "block_size", "channels", "chips_per_channel", *METRICS]
+
+# 모니터링용 plot이라 해상도/압축률보다 저장 속도 우선
+# PNG(zlib) 대신 WebP로 저장: 인코딩이 더 빠르고 파일도 더 작음
+SAVE_DPI = 80
+WEBP_OPTIONS = {"quality": 85, "method": 0}  # method 0 = 가장 빠른 인코더 설정
+
+# Feather 캐시 형식 버전: build_dataframe()의 변환(dtype, 파생 컬럼)을 바꾸면 올릴 것
+CACHE_VERSION = 1
+
+SUBPLOT_DEFAULTS = {
+    k: matplotlib.rcParams[f"figure.subplot.{k}"]
+    for k in ("left", "right", "bottom", "top", "wspace", "hspace")
+}
+
+
+def cache_path_for(path: str) -> str:
+    # 캐시 파일 이름에 형식 버전 + NEEDED 해시를 넣어
+    # 컬럼 목록이나 변환이 바뀌면 예전 캐시를 쓰지 않음
+    key = hashlib.sha1(f"{CACHE_VERSION}|{'|'.join(NEEDED)}".encode()).hexdigest()[:12]
+    return f"{path}.{key}.feather"
+
 
 def build_dataframe(path: str) -> pd.DataFrame:
-    df = pd.read_csv(path)
+    # CSV보다 새로운 Feather 캐시가 있으면 CSV 파싱을 건너뜀
+    cache_path = cache_path_for(path)
+    if (os.path.exists(cache_path)
+            and os.path.getmtime(cache_path) >= os.path.getmtime(path)):
+        cached = pd.read_feather(cache_path)
+        if set(NEEDED) <= set(cached.columns) and "workload" in cached.columns:
+            return cached
+        print(f"[warn] Feather 캐시 컬럼 불일치 ({cache_path}), CSV를 다시 읽음")
+
+    table = pa_csv.read_csv(
+        path,
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=NEEDED,
+            strings_can_be_null=True,  # pd.read_csv처럼 빈 문자열은 NaN
+        ),
+    )
+    df = table.to_pandas(split_blocks=True, self_destruct=True)
 
     # workload 이름 통합 (synthetic + tpcc)
-    def workload_label(row):
-        if row["access_pattern"] == "tpcc":
-            return "tpcc"
-        else:
-            return f"{row['access_pattern']}_{row['block_size']}"
-
-    df["workload"] = df.apply(workload_label, axis=1)
+    ap = df["access_pattern"].to_numpy()
+    bs = df["block_size"].to_numpy()
+    df["workload"] = np.where(
+        ap == "tpcc",
+        "tpcc",
+        np.char.add(np.char.add(ap.astype(str), "_"), bs.astype(str)),
+    )
+    # 반복되는 문자열 → category (정수 code로 비교/분할)
+    df["workload"] = df["workload"].astype("category")
+    df["access_pattern"] = df["access_pattern"].astype("category")
+
+    try:
+        df.to_feather(cache_path, compression="lz4")
+    except OSError as e:
+        print(f"[warn] Feather 캐시 저장 실패 ({cache_path}): {e}")
     return df
 
 
-def plot_metric_vs_param(df: pd.DataFrame,
+def save_figure(fig: plt.Figure, path: str) -> None:
+    # 같은 Figure를 재사용하므로 이전 plot의 tight_layout 여백을 지우고 다시 계산
+    fig.subplots_adjust(**SUBPLOT_DEFAULTS)
+    fig.tight_layout()
+    fig.savefig(path, format="webp", dpi=SAVE_DPI, pil_kwargs=WEBP_OPTIONS)
+
+
+def split_by_workload(workload, x: Optional[np.ndarray] = None):
+    """
+    pandas groupby 대신 한 번의 lexsort로 workload별 구간을 나눔.
+    workload가 Categorical이면 factorize는 category code를 그대로 사용.
+    반환: (workload 이름들(정렬됨), 정렬 index, 구간 경계)
+    → i번째 workload의 row는 order[bounds[i]:bounds[i + 1]]
+    x를 주면 각 workload 안에서 x 오름차순으로 정렬.
+    """
+    codes, names = pd.factorize(workload, sort=True)
+    keys = (codes,) if x is None else (x, codes)
+    order = np.lexsort(keys)
+    codes = codes[order]
+    bounds = np.concatenate([[0], np.flatnonzero(np.diff(codes)) + 1, [len(codes)]])
+    return names, order, bounds
+
+
+def plot_metric_vs_param(ax: plt.Axes,
+                         base: pd.DataFrame,
                          param_col: str,
                          metric_col: str,
                          outdir: str,
                          title_suffix: str,
                          xlabel: str):
-    use = df.dropna(subset=[param_col, metric_col, "workload"]).copy()
-    if use.empty:
+    """
+    base: main()에서 axis별로 한 번만 만든 DataFrame
+          (workload/param_col이 비어있는 row는 이미 제외됨)
+    """
+    # metric 값이 있는 row만 사용 (DataFrame 복사 없이 numpy mask로)
+    y = base[metric_col].to_numpy(dtype=float)
+    mask = np.isfinite(y)
+    if not mask.any():
         print(f"[skip] {metric_col} ({title_suffix}) 데이터 없음")
         return
 
-    use["x"] = use[param_col].astype(float)
-
-    labels = {
-       "host_BW_MiB_per_s" : "Host Bandwidth (MiB/s)",
-        "host_IOPS" : "Host IOPS",
-        "host_E2E_Latency_ms_assuming_us" : "Host E2E Latency (ms)",
-        "tsu_User_Transactions_Enqueued" : "TSU User Transactions Enqueued",
-        "ftl_Total_Flash_Read_CMD" : "FTL Total Flash Read CMD",
-        "ftl_Total_Flash_Program_CMD" : "FTL Total Flash Program CMD",
-        "ftl_Total_Flash_Erase_CMD" : "FTL Total Flash Erase CMD",
-        "ftl_CMT_Hit_Rate" : "FTL CMT Hit Rate",
-        "ftl_Total_GC_Executions" : "FTL Total GC Executions",
-        "chip_Avg_Fraction_Idle" : "Chip Avg Fraction Idle",
-        "chip_Avg_Fraction_DataXfer" : "Chip Avg Fraction DataXfer",
-        "chip_Avg_Fraction_Exec" : "Chip Avg Fraction Exec",
-        "energy_Energy_per_IO_Index" : "Power(Energy/IO)", 
-    }
-    y_label = labels[metric_col] if metric_col in labels else metric_col
-
-    plt.figure()
-    for wl, sub in use.groupby("workload"):
-        sub = sub.sort_values("x")
-        plt.plot(sub["x"], sub[metric_col], marker="o", label=wl)
-
-    plt.xlabel(xlabel)
-    plt.ylabel(y_label)
-    plt.title(f"{y_label} vs {title_suffix}")
-    plt.grid(True)
-    plt.legend()
-
-    os.makedirs(outdir, exist_ok=True)
-    fname = f"{metric_col.replace('/','_per_')}_vs_{param_col}_{title_suffix.replace(' ','_')}.png"
-    plt.tight_layout()
+    y_label = _METRIC_LABELS.get(metric_col, metric_col)
+
+    # workload별 구간은 한 번의 lexsort로 나눔 (groupby 없이)
+    x = base[param_col].to_numpy(dtype=float)[mask]
+    y = y[mask]
+    names, order, bounds = split_by_workload(base["workload"].array[mask], x)
+    x, y = x[order], y[order]
+
+    # 선은 workload마다 ax.plot()으로 그림: legend loc="best"가 Line2D만 피해 가므로
+    # LineCollection으로 묶으면 범례가 데이터 위에 놓임
+    ax.clear()
+    for wl, b, e in zip(names, bounds[:-1], bounds[1:]):
+        ax.plot(x[b:e], y[b:e], marker="o", label=wl)
+
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(y_label)
+    ax.set_title(f"{y_label} vs {title_suffix}")
+    ax.grid(True)
+    ax.legend()
+
+    fname = f"{metric_col.replace('/','_per_')}_vs_{param_col}_{title_suffix.replace(' ','_')}.webp"
     path = os.path.join(outdir, fname)
-    plt.savefig(path)
-    plt.close()
+    save_figure(ax.figure, path)
     print("[saved] ", path)
 
 
-def plot_heatmap_channels_ways(df: pd.DataFrame,
+def plot_heatmap_channels_ways(ax: plt.Axes,
+                               df: pd.DataFrame,
                                metric_col: str,
                                outdir: str):
     """
     channels × chips_per_channel 2D heatmap (workload별)
     """
-    use = df.dropna(subset=["channels", "chips_per_channel", metric_col, "workload"]).copy()
+    # 읽기 전용으로만 쓰므로 copy 불필요
+    use = df.dropna(subset=["channels", "chips_per_channel", metric_col, "workload"])
     if use.empty:
         print(f"[skip] heatmap {metric_col} 데이터 없음")
         return
 
-    os.makedirs(outdir, exist_ok=True)
+    names, order, bounds = split_by_workload(use["workload"].array)
+    for wl, b, e in zip(names, bounds[:-1], bounds[1:]):
+        sub = use.iloc[order[b:e]]
+        ch = sub["channels"].to_numpy()
+        wy = sub["chips_per_channel"].to_numpy()
 
-    for wl, sub in use.groupby("workload"):
-        pivot = sub.pivot(index="chips_per_channel", columns="channels", values=metric_col)
-
-        if pivot.shape[0] < 2 or pivot.shape[1] < 2:
+        # pivot 대신 (ways × channels) 격자를 numpy index로 바로 채움
+        ch_vals = np.unique(ch)
+        wy_vals = np.unique(wy)
+        if len(wy_vals) < 2 or len(ch_vals) < 2:
             # 격자점이 너무 적으면 의미가 없음
             continue
+        # 같은 (channels, ways) 칸에 row가 여러 개면 (예: scenario 반복 실행) 평균을 씀
+        idx = (np.searchsorted(wy_vals, wy), np.searchsorted(ch_vals, ch))
+        sums = np.zeros((len(wy_vals), len(ch_vals)))
+        counts = np.zeros_like(sums)
+        np.add.at(sums, idx, sub[metric_col].to_numpy(dtype=float))
+        np.add.at(counts, idx, 1)
+        with np.errstate(invalid="ignore"):
+            grid = sums / counts  # 빈 칸은 0/0 → NaN
+
+        ax.clear()
+        im = ax.imshow(grid,
+                       origin="lower",
+                       aspect="auto")
+
+        cbar = ax.figure.colorbar(im, ax=ax, label=metric_col)
+        ax.set_xticks(range(len(ch_vals)), ch_vals)
+        ax.set_yticks(range(len(wy_vals)), wy_vals)
+        ax.set_xlabel("Number of channels")
+        ax.set_ylabel("Chips per channel (ways)")
+        ax.set_title(f"{wl}: {metric_col} (channels × ways)")
+
+        fname = f"{metric_col.replace('/','_per_')}_heatmap_{wl}.webp"
+        path = os.path.join(outdir, fname)
+        save_figure(ax.figure, path)
+        # colorbar는 별도 Axes라 clear()로 안 지워짐 → 다음 plot 전에 제거
+        cbar.remove()
+        print("[saved] ", path)
 
-        plt.figure()
-        im = plt.imshow(pivot.values,
-                        origin="lower",
-                        aspect="auto")
 
-        plt.colorbar(im, label=metric_col)
-        plt.xticks(range(len(pivot.columns)), pivot.columns)
-        plt.yticks(range(len(pivot.index)), pivot.index)
-        plt.xlabel("Number of channels")
-        plt.ylabel("Chips per channel (ways)")
-        plt.title(f"{wl}: {metric_col} (channels × ways)")
+# ----------------------------------------------------------------------
+# 병렬 plot: worker 프로세스마다 데이터와 Figure/Axes를 한 번씩만 준비
+# ----------------------------------------------------------------------
+_FRAMES: Dict[str, pd.DataFrame] = {}
+_AX: Optional[plt.Axes] = None
 
-        fname = f"{metric_col.replace('/','_per_')}_heatmap_{wl}.png"
-        plt.tight_layout()
-        path = os.path.join(outdir, fname)
-        plt.savefig(path)
-        plt.close()
-        print("[saved] ", path)
+
+def _init_worker(frames: Dict[str, pd.DataFrame]) -> None:
+    global _FRAMES, _AX
+    _FRAMES = frames
+    _, _AX = plt.subplots()
+
+
+def _run_plot_task(task: Tuple[str, str, str, Dict[str, Any]]) -> None:
+    kind, frame_key, metric_col, kwargs = task
+    if kind == "heatmap":
+        plot_heatmap_channels_ways(_AX, _FRAMES[frame_key], metric_col, **kwargs)
+    else:
+        plot_metric_vs_param(_AX, _FRAMES[frame_key], metric_col=metric_col, **kwargs)
 
 
 def main():
     df = build_dataframe(SUMMARY_CSV)
 
-    metrics = [
-        "host_BW_MiB_per_s",
-        "host_IOPS",
-        "host_E2E_Latency_ms_assuming_us",
-        "tsu_User_Transactions_Enqueued",
-        "ftl_Total_Flash_Read_CMD",
-        "ftl_Total_Flash_Program_CMD",
-        "ftl_Total_Flash_Erase_CMD",
-        "ftl_CMT_Hit_Rate",
-        "ftl_Total_GC_Executions",
-        "chip_Avg_Fraction_Idle",
-        "chip_Avg_Fraction_DataXfer",
-        "chip_Avg_Fraction_Exec",
-        "energy_Energy_per_IO_Index",
-    ]
-
     # -------------------------------
     # 1) Flash channels axis
     #    예: chips_per_channel == 4 로 고정 (baseline ways)
     # -------------------------------
-    df_ch_axis = df[(df["channels"].notna()) & (df["chips_per_channel"] == 4)].copy()
+    df_ch_axis = df.loc[(df["channels"].notna()) & (df["chips_per_channel"] == 4)]
+    ch_base = (
+        df_ch_axis[["workload", "channels", *METRICS]]
+        .dropna(subset=["workload", "channels"])
+        .reset_index(drop=True)
+    )
     ch_dir = os.path.join(OUTPUT_ROOT, "flash_channels_axis_ways4")
 
-    for m in metrics:
-        plot_metric_vs_param(df_ch_axis,
-                             param_col="channels",
-                             metric_col=m,
-                             outdir=ch_dir,
-                             title_suffix="Flash channels (ways=4)",
-                             xlabel="Number of channels")
-
     # -------------------------------
     # 2) Flash ways axis
     #    예: channels == 8 로 고정 (baseline channels)
     # -------------------------------
-    df_ways_axis = df[(df["chips_per_channel"].notna()) & (df["channels"] == 8)].copy()
+    df_ways_axis = df.loc[(df["chips_per_channel"].notna()) & (df["channels"] == 8)]
+    ways_base = (
+        df_ways_axis[["workload", "chips_per_channel", *METRICS]]
+        .dropna(subset=["workload", "chips_per_channel"])
+        .reset_index(drop=True)
+    )
     ways_dir = os.path.join(OUTPUT_ROOT, "flash_ways_axis_ch8")
 
-    for m in metrics:
-        plot_metric_vs_param(df_ways_axis,
-                             param_col="chips_per_channel",
-                             metric_col=m,
-                             outdir=ways_dir,
-                             title_suffix="Flash ways (channels=8)",
-                             xlabel="Chips per channel (ways)")
-
     # -------------------------------
     # 3) 전체 2D 효과 보기 (channels × ways heatmap)
     # -------------------------------
     heatmap_dir = os.path.join(OUTPUT_ROOT, "flash_channels_ways_heatmap")
-    for m in metrics:
-        plot_heatmap_channels_ways(df, m, heatmap_dir)
 
+    # (종류, 데이터, metric, plot 인자) — plot 하나가 task 하나
+    tasks = []
+    for m in METRICS:
+        tasks.append(("line", "ch", m, dict(param_col="channels",
+                                            outdir=ch_dir,
+                                            title_suffix="Flash channels (ways=4)",
+                                            xlabel="Number of channels")))
+    for m in METRICS:
+        tasks.append(("line", "ways", m, dict(param_col="chips_per_channel",
+                                              outdir=ways_dir,
+                                              title_suffix="Flash ways (channels=8)",
+                                              xlabel="Chips per channel (ways)")))
+    for m in METRICS:
+        tasks.append(("heatmap", "all", m, dict(outdir=heatmap_dir)))
+
+    # 출력 폴더는 plot마다가 아니라 여기서 한 번만 생성
+    for d in (ch_dir, ways_dir, heatmap_dir):
+        os.makedirs(d, exist_ok=True)
+
+    # plot끼리는 서로 독립 → 프로세스 여러 개로 나눠서 그림 (Agg는 프로세스 단위로 안전)
+    frames = {"ch": ch_base, "ways": ways_base, "all": df}
+    with ProcessPoolExecutor(initializer=_init_worker, initargs=(frames,)) as ex:
+        list(ex.map(_run_plot_task, tasks))
 
 if __name__ == "__main__":
     main()